@@ -1,19 +1,156 @@
 from __future__ import annotations
 
-from datetime import date
-from typing import List, Optional, Tuple
-
-from sqlalchemy import select, func, and_, or_, text
+import time
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, exists, insert, literal, null, select, func, and_, or_, text, union_all, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from . import models, schemas
 
 
+# Statements are built once at import time with bind parameters so every call
+# reuses the engine's compiled-statement cache instead of rebuilding the query.
+_LIST_CATEGORIES_STMT = select(models.Category).order_by(models.Category.sort_order, models.Category.name)
+
+_ACTIVITY_ORDER = (models.Activity.category_id, models.Activity.sort_order, models.Activity.name)
+_LIST_ACTIVITIES_STMT = select(models.Activity).order_by(*_ACTIVITY_ORDER)
+_LIST_ACTIVITIES_BY_CATEGORY_STMT = (
+    select(models.Activity).where(models.Activity.category_id == bindparam("category_id")).order_by(*_ACTIVITY_ORDER)
+)
+
+# Column-only listings for dropdowns and tables that never need mapped objects
+_LIST_CATEGORIES_BRIEF_STMT = select(models.Category.id, models.Category.name, models.Category.color_hex).order_by(
+    models.Category.sort_order, models.Category.name
+)
+_LIST_ACTIVITIES_BRIEF_STMT = (
+    select(
+        models.Activity.id,
+        models.Activity.name,
+        models.Activity.category_id,
+        models.Category.name.label("category_name"),
+    )
+    .join(models.Category, models.Activity.category_id == models.Category.id)
+    .order_by(*_ACTIVITY_ORDER)
+)
+_LIST_ACTIVITIES_BRIEF_BY_CATEGORY_STMT = _LIST_ACTIVITIES_BRIEF_STMT.where(
+    models.Activity.category_id == bindparam("category_id")
+)
+
+# Reports read from the daily_totals rollup; HAVING drops rows whose entries were all removed
+_ROLLUP_SUM = func.coalesce(func.sum(models.DailyTotal.total_minutes), 0)
+_ROLLUP_IN_RANGE = models.DailyTotal.date.between(bindparam("start"), bindparam("end"))
+
+_REPORT_KIND_CATEGORY = 0
+_REPORT_KIND_ACTIVITY = 1
+
+
+def _build_range_totals_stmt():
+    # Category and activity totals share one round-trip: the range filter runs once in
+    # a CTE and the two aggregates are UNION ALLed behind a kind discriminator. Each
+    # branch leaves the other's column NULL: categories fill color_hex, activities
+    # category_id. Compound selects can only ORDER BY result columns, and NULL
+    # category_id keeps categories in (sort_order, name) order.
+    range_cte = (
+        select(models.DailyTotal.category_id, models.DailyTotal.activity_id, models.DailyTotal.total_minutes)
+        .where(_ROLLUP_IN_RANGE)
+        .cte("rollup_range")
+    )
+    range_sum = func.coalesce(func.sum(range_cte.c.total_minutes), 0)
+    category_branch = (
+        select(
+            literal(_REPORT_KIND_CATEGORY).label("kind"),
+            models.Category.id,
+            models.Category.name,
+            models.Category.color_hex,
+            null().label("category_id"),
+            range_sum.label("total"),
+            models.Category.sort_order,
+        )
+        .join(range_cte, range_cte.c.category_id == models.Category.id)
+        .group_by(models.Category.id)
+        .having(range_sum > 0)
+    )
+    activity_branch = (
+        select(
+            literal(_REPORT_KIND_ACTIVITY),
+            models.Activity.id,
+            models.Activity.name,
+            null(),
+            models.Activity.category_id,
+            range_sum,
+            models.Activity.sort_order,
+        )
+        .join(range_cte, range_cte.c.activity_id == models.Activity.id)
+        .group_by(models.Activity.id)
+        .having(range_sum > 0)
+    )
+    union = union_all(category_branch, activity_branch)
+    columns = union.selected_columns
+    return union.order_by(columns.kind, columns.category_id, columns.sort_order, columns.name)
+
+
+_RANGE_TOTALS_STMT = _build_range_totals_stmt()
+
+# Unassigned minutes (activity_id 0) find no activity row and sort last
+_ACTIVITY_TOTALS_IN_RANGE_STMT = (
+    select(func.coalesce(models.Activity.name, "Unassigned"), _ROLLUP_SUM)
+    .outerjoin(models.Activity, models.DailyTotal.activity_id == models.Activity.id)
+    .where(_ROLLUP_IN_RANGE)
+    .group_by(models.DailyTotal.activity_id)
+    .having(_ROLLUP_SUM > 0)
+    .order_by(models.DailyTotal.activity_id == 0, _ROLLUP_SUM.desc())
+)
+
+
+def _build_upsert_daily_total_stmt():
+    # Adds the delta to an existing (date, category, activity) row instead of replacing it
+    stmt = sqlite_insert(models.DailyTotal)
+    return stmt.on_conflict_do_update(
+        index_elements=["date", "category_id", "activity_id"],
+        set_={"total_minutes": models.DailyTotal.total_minutes + stmt.excluded.total_minutes},
+    )
+
+
+_UPSERT_DAILY_TOTAL_STMT = _build_upsert_daily_total_stmt()
+
+# Core insert fills the remaining columns from their Python-side defaults
+_INSERT_SETTINGS_STMT = sqlite_insert(models.Settings).values(id=1).on_conflict_do_nothing()
+
+_ROLLUP_KEY = (models.Entry.date, models.Entry.category_id, func.coalesce(models.Entry.activity_id, 0))
+_REBUILD_DAILY_TOTALS_STMT = insert(models.DailyTotal).from_select(
+    ["date", "category_id", "activity_id", "total_minutes"],
+    select(*_ROLLUP_KEY, func.sum(models.Entry.duration_minutes)).group_by(*_ROLLUP_KEY),
+)
+_HAS_ENTRIES_STMT = select(select(models.Entry.id).exists())
+_HAS_DAILY_TOTALS_STMT = select(select(models.DailyTotal.date).exists())
+
+_CATEGORY_IN_USE_STMT = select(
+    or_(
+        exists().where(models.Entry.category_id == bindparam("category_id")),
+        exists().where(models.Activity.category_id == bindparam("category_id")),
+    )
+)
+_DELETE_CATEGORY_STMT = delete(models.Category).where(models.Category.id == bindparam("category_id"))
+
+_ACTIVITY_CATEGORY_ID_STMT = select(models.Activity.category_id).where(models.Activity.id == bindparam("activity_id"))
+_ACTIVITY_IN_USE_STMT = select(exists().where(models.Entry.activity_id == bindparam("activity_id")))
+_DELETE_ACTIVITY_STMT = delete(models.Activity).where(models.Activity.id == bindparam("activity_id"))
+
+
 # Categories
 def list_categories(db: Session) -> List[models.Category]:
-    stmt = select(models.Category).order_by(models.Category.sort_order, models.Category.name)
-    return list(db.scalars(stmt).all())
+    return list(db.scalars(_LIST_CATEGORIES_STMT).all())
+
+
+def list_categories_brief(db: Session) -> List[Row]:
+    # Rows of (id, name, color_hex)
+    return list(db.execute(_LIST_CATEGORIES_BRIEF_STMT).all())
 
 
 def get_category(db: Session, category_id: int) -> Optional[models.Category]:
@@ -29,7 +166,6 @@ def create_category(db: Session, data: schemas.CategoryCreate) -> models.Categor
     )
     db.add(category)
     db.commit()
-    db.refresh(category)
     return category
 
 
@@ -40,37 +176,41 @@ def update_category(db: Session, category_id: int, data: schemas.CategoryUpdate)
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(category, field, value)
     db.commit()
-    db.refresh(category)
     return category
 
 
 def delete_category(db: Session, category_id: int) -> bool:
-    category = get_category(db, category_id)
-    if not category:
-        return False
+    params = {"category_id": category_id}
     # Prevent deletion if referenced by entries or activities
-    entries_count = db.scalar(select(func.count()).select_from(models.Entry).where(models.Entry.category_id == category_id))
-    activities_count = db.scalar(select(func.count()).select_from(models.Activity).where(models.Activity.category_id == category_id))
-    if entries_count or activities_count:
+    if db.scalar(_CATEGORY_IN_USE_STMT, params):
         return False
-    db.delete(category)
+    deleted = db.execute(_DELETE_CATEGORY_STMT, params).rowcount
     db.commit()
-    return True
+    return bool(deleted)
 
 
 # Activities
 def list_activities(db: Session, category_id: Optional[int] = None) -> List[models.Activity]:
-    stmt = select(models.Activity)
     if category_id is not None:
-        stmt = stmt.where(models.Activity.category_id == category_id)
-    stmt = stmt.order_by(models.Activity.category_id, models.Activity.sort_order, models.Activity.name)
-    return list(db.scalars(stmt).all())
+        return list(db.scalars(_LIST_ACTIVITIES_BY_CATEGORY_STMT, {"category_id": category_id}).all())
+    return list(db.scalars(_LIST_ACTIVITIES_STMT).all())
+
+
+def list_activities_brief(db: Session, category_id: Optional[int] = None) -> List[Row]:
+    # Rows of (id, name, category_id, category_name)
+    if category_id is not None:
+        return list(db.execute(_LIST_ACTIVITIES_BRIEF_BY_CATEGORY_STMT, {"category_id": category_id}).all())
+    return list(db.execute(_LIST_ACTIVITIES_BRIEF_STMT).all())
 
 
 def get_activity(db: Session, activity_id: int) -> Optional[models.Activity]:
     return db.get(models.Activity, activity_id)
 
 
+def get_activity_category_id(db: Session, activity_id: int) -> Optional[int]:
+    return db.scalar(_ACTIVITY_CATEGORY_ID_STMT, {"activity_id": activity_id})
+
+
 def create_activity(db: Session, data: schemas.ActivityCreate) -> models.Activity:
     activity = models.Activity(
         name=data.name,
@@ -79,7 +219,6 @@ def create_activity(db: Session, data: schemas.ActivityCreate) -> models.Activit
     )
     db.add(activity)
     db.commit()
-    db.refresh(activity)
     return activity
 
 
@@ -90,24 +229,37 @@ def update_activity(db: Session, activity_id: int, data: schemas.ActivityUpdate)
     for field, value in data.model_dump(exclude_unset=True).items():
         setattr(activity, field, value)
     db.commit()
-    db.refresh(activity)
     return activity
 
 
 def delete_activity(db: Session, activity_id: int) -> bool:
-    activity = get_activity(db, activity_id)
-    if not activity:
-        return False
+    params = {"activity_id": activity_id}
     # Prevent deletion if referenced by entries
-    entries_count = db.scalar(select(func.count()).select_from(models.Entry).where(models.Entry.activity_id == activity_id))
-    if entries_count:
+    if db.scalar(_ACTIVITY_IN_USE_STMT, params):
         return False
-    db.delete(activity)
+    deleted = db.execute(_DELETE_ACTIVITY_STMT, params).rowcount
     db.commit()
-    return True
+    return bool(deleted)
 
 
 # Entries
+@lru_cache(maxsize=None)
+def _list_entries_stmt(eager: bool, has_from: bool, has_to: bool, has_category: bool, has_activity: bool):
+    # One statement per combination of active filters (at most 32)
+    stmt = select(models.Entry)
+    if eager:
+        stmt = stmt.options(selectinload(models.Entry.category), selectinload(models.Entry.activity))
+    if has_from:
+        stmt = stmt.where(models.Entry.date >= bindparam("date_from"))
+    if has_to:
+        stmt = stmt.where(models.Entry.date <= bindparam("date_to"))
+    if has_category:
+        stmt = stmt.where(models.Entry.category_id == bindparam("category_id"))
+    if has_activity:
+        stmt = stmt.where(models.Entry.activity_id == bindparam("activity_id"))
+    return stmt.order_by(models.Entry.date.desc(), models.Entry.id.desc())
+
+
 def list_entries(
     db: Session,
     *,
@@ -115,31 +267,86 @@ def list_entries(
     date_to: Optional[date] = None,
     category_id: Optional[int] = None,
     activity_id: Optional[int] = None,
+    eager: bool = False,
 ) -> List[models.Entry]:
-    stmt = select(models.Entry)
-    if date_from is not None:
-        stmt = stmt.where(models.Entry.date >= date_from)
-    if date_to is not None:
-        stmt = stmt.where(models.Entry.date <= date_to)
-    if category_id is not None:
-        stmt = stmt.where(models.Entry.category_id == category_id)
-    if activity_id is not None:
-        stmt = stmt.where(models.Entry.activity_id == activity_id)
-    stmt = stmt.order_by(models.Entry.date.desc(), models.Entry.id.desc())
-    return list(db.scalars(stmt).all())
+    # eager=True loads category and activity up front for callers that read them per row
+    params = {
+        "date_from": date_from,
+        "date_to": date_to,
+        "category_id": category_id,
+        "activity_id": activity_id,
+    }
+    stmt = _list_entries_stmt(eager, *(value is not None for value in params.values()))
+    params = {key: value for key, value in params.items() if value is not None}
+    return list(db.scalars(stmt, params).all())
+
+
+@lru_cache(maxsize=None)
+def _export_entries_stmt(has_from: bool, has_to: bool):
+    stmt = (
+        select(
+            models.Entry.id,
+            models.Entry.date,
+            models.Category.name,
+            models.Activity.name,
+            models.Entry.duration_minutes,
+            models.Entry.notes,
+        )
+        .join(models.Category, models.Entry.category_id == models.Category.id)
+        .outerjoin(models.Activity, models.Entry.activity_id == models.Activity.id)
+    )
+    if has_from:
+        stmt = stmt.where(models.Entry.date >= bindparam("date_from"))
+    if has_to:
+        stmt = stmt.where(models.Entry.date <= bindparam("date_to"))
+    return stmt.order_by(models.Entry.date.desc(), models.Entry.id.desc())
+
+
+def export_entry_rows(
+    db: Session,
+    *,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    chunk_size: int = 1000,
+) -> Iterator[Sequence[Row]]:
+    # Plain (id, date, category, activity, duration, notes) tuples, fetched chunk_size at a time
+    params = {"date_from": date_from, "date_to": date_to}
+    stmt = _export_entries_stmt(date_from is not None, date_to is not None)
+    params = {key: value for key, value in params.items() if value is not None}
+    return db.execute(stmt, params).yield_per(chunk_size).partitions()
 
 
 def get_entry(db: Session, entry_id: int) -> Optional[models.Entry]:
     return db.get(models.Entry, entry_id)
 
 
+def _daily_delta(entry_date: date, category_id: int, activity_id: Optional[int], minutes: int) -> dict:
+    return {"date": entry_date, "category_id": category_id, "activity_id": activity_id or 0, "total_minutes": minutes}
+
+
+def _apply_daily_deltas(db: Session, deltas: List[dict]) -> None:
+    # Runs inside the caller's transaction so the rollup commits with the entry change
+    db.execute(_UPSERT_DAILY_TOTAL_STMT, deltas)
+
+
+def rebuild_daily_totals(db: Session) -> None:
+    db.execute(delete(models.DailyTotal))
+    db.execute(_REBUILD_DAILY_TOTALS_STMT)
+
+
+def ensure_daily_totals(db: Session) -> None:
+    # Backfill the rollup for databases created before it existed
+    if db.scalar(_HAS_ENTRIES_STMT) and not db.scalar(_HAS_DAILY_TOTALS_STMT):
+        rebuild_daily_totals(db)
+
+
 def create_entry(db: Session, data: schemas.EntryCreate) -> models.Entry:
     # Enforce category/activity consistency if both provided
     if data.activity_id is not None:
-        activity = get_activity(db, data.activity_id)
-        if not activity:
+        activity_category_id = get_activity_category_id(db, data.activity_id)
+        if activity_category_id is None:
             raise ValueError("Activity not found")
-        if activity.category_id != data.category_id:
+        if activity_category_id != data.category_id:
             raise ValueError("Activity does not belong to the provided category")
 
     entry = models.Entry(
@@ -150,8 +357,8 @@ def create_entry(db: Session, data: schemas.EntryCreate) -> models.Entry:
         notes=data.notes,
     )
     db.add(entry)
+    _apply_daily_deltas(db, [_daily_delta(data.date, data.category_id, data.activity_id, data.duration_minutes)])
     db.commit()
-    db.refresh(entry)
     return entry
 
 
@@ -160,21 +367,27 @@ def update_entry(db: Session, entry_id: int, data: schemas.EntryUpdate) -> Optio
     if not entry:
         return None
     payload = data.model_dump(exclude_unset=True)
+    if not payload:
+        return entry
 
-    # If both are present or either changes, enforce consistency
+    # If both are present or either changes, enforce consistency inside the UPDATE itself
     new_category_id = payload.get("category_id", entry.category_id)
     new_activity_id = payload.get("activity_id", entry.activity_id)
+    stmt = update(models.Entry).where(models.Entry.id == entry_id).values(**payload)
     if new_activity_id is not None:
-        activity = get_activity(db, new_activity_id)
-        if not activity:
-            raise ValueError("Activity not found")
-        if activity.category_id != new_category_id:
-            raise ValueError("Activity does not belong to the provided category")
+        stmt = stmt.where(
+            exists().where(models.Activity.id == new_activity_id, models.Activity.category_id == new_category_id)
+        )
 
-    for field, value in payload.items():
-        setattr(entry, field, value)
+    old_delta = _daily_delta(entry.date, entry.category_id, entry.activity_id, -entry.duration_minutes)
+    if db.execute(stmt.execution_options(synchronize_session="fetch")).rowcount == 0:
+        # The entry exists, so only the activity check can have rejected the row
+        if get_activity_category_id(db, new_activity_id) is None:
+            raise ValueError("Activity not found")
+        raise ValueError("Activity does not belong to the provided category")
+    new_delta = _daily_delta(entry.date, entry.category_id, entry.activity_id, entry.duration_minutes)
+    _apply_daily_deltas(db, [old_delta, new_delta])
     db.commit()
-    db.refresh(entry)
     return entry
 
 
@@ -182,127 +395,76 @@ def delete_entry(db: Session, entry_id: int) -> bool:
     entry = get_entry(db, entry_id)
     if not entry:
         return False
+    _apply_daily_deltas(db, [_daily_delta(entry.date, entry.category_id, entry.activity_id, -entry.duration_minutes)])
     db.delete(entry)
     db.commit()
     return True
 
 
 # Reports
+def _range_totals(db: Session, start: date, end: date) -> Tuple[List[Tuple], List[Tuple]]:
+    # Category rows are (id, name, color_hex, total); activity rows (id, name, category_id, total)
+    category_rows: List[Tuple] = []
+    activity_rows: List[Tuple] = []
+    for row in db.execute(_RANGE_TOTALS_STMT, {"start": start, "end": end}):
+        if row.kind == _REPORT_KIND_CATEGORY:
+            category_rows.append((row.id, row.name, row.color_hex, row.total))
+        else:
+            activity_rows.append((row.id, row.name, row.category_id, row.total))
+    return category_rows, activity_rows
+
+
 def weekly_totals(db: Session, week_start: date) -> Tuple[List[Tuple], List[Tuple]]:
-    week_end = week_start.replace()  # date object; compute end as +6 days
-    from datetime import timedelta
+    return _range_totals(db, week_start, week_start + timedelta(days=6))
 
-    week_end = week_start + timedelta(days=6)
 
-    # Category totals
-    cat_stmt = (
-        select(
-            models.Category.id,
-            models.Category.name,
-            models.Category.color_hex,
-            func.coalesce(func.sum(models.Entry.duration_minutes), 0),
-        )
-        .join(models.Entry, models.Entry.category_id == models.Category.id, isouter=True)
-        .where(models.Entry.date.between(week_start, week_end))
-        .group_by(models.Category.id)
-        .order_by(models.Category.sort_order, models.Category.name)
-    )
-    category_rows = list(db.execute(cat_stmt).all())
+def monthly_totals(db: Session, month_start: date, month_end: date) -> Tuple[List[Tuple], List[Tuple]]:
+    return _range_totals(db, month_start, month_end)
 
-    # Activity totals
-    act_stmt = (
-        select(
-            models.Activity.id,
-            models.Activity.name,
-            models.Activity.category_id,
-            func.coalesce(func.sum(models.Entry.duration_minutes), 0),
-        )
-        .join(models.Entry, models.Entry.activity_id == models.Activity.id, isouter=True)
-        .where(models.Entry.date.between(week_start, week_end))
-        .group_by(models.Activity.id)
-        .order_by(models.Activity.category_id, models.Activity.sort_order, models.Activity.name)
-    )
-    activity_rows = list(db.execute(act_stmt).all())
 
-    return category_rows, activity_rows
+def activity_totals_in_range(db: Session, start_date: date, end_date: date) -> List[Tuple[str, int]]:
+    if start_date > end_date:
+        return []
+    rows = db.execute(_ACTIVITY_TOTALS_IN_RANGE_STMT, {"start": start_date, "end": end_date})
+    return [(name, int(total)) for name, total in rows]
 
 
-def monthly_totals(db: Session, month_start: date, month_end: date) -> Tuple[List[Tuple], List[Tuple]]:
-    # Category totals
-    cat_stmt = (
-        select(
-            models.Category.id,
-            models.Category.name,
-            models.Category.color_hex,
-            func.coalesce(func.sum(models.Entry.duration_minutes), 0),
-        )
-        .join(models.Entry, models.Entry.category_id == models.Category.id, isouter=True)
-        .where(models.Entry.date.between(month_start, month_end))
-        .group_by(models.Category.id)
-        .order_by(models.Category.sort_order, models.Category.name)
-    )
-    category_rows = list(db.execute(cat_stmt).all())
+# Settings
+# Settings change rarely, so each process keeps a read-only snapshot. Writes through
+# update_settings invalidate it immediately; the TTL bounds staleness across workers.
+SETTINGS_CACHE_TTL_SECONDS = 30.0
+_settings_cache: Optional[schemas.SettingsRead] = None
+_settings_cache_expires_at = 0.0
 
-    # Activity totals
-    act_stmt = (
-        select(
-            models.Activity.id,
-            models.Activity.name,
-            models.Activity.category_id,
-            func.coalesce(func.sum(models.Entry.duration_minutes), 0),
-        )
-        .join(models.Entry, models.Entry.activity_id == models.Activity.id, isouter=True)
-        .where(models.Entry.date.between(month_start, month_end))
-        .group_by(models.Activity.id)
-        .order_by(models.Activity.category_id, models.Activity.sort_order, models.Activity.name)
-    )
-    activity_rows = list(db.execute(act_stmt).all())
 
-    return category_rows, activity_rows
+def ensure_settings(db: Session) -> None:
+    # Startup creates the singleton row once, so reads never need an insert fallback
+    db.execute(_INSERT_SETTINGS_STMT)
 
 
-def activity_totals_in_range(db: Session, start_date: date, end_date: date) -> List[Tuple[str, int]]:
-    # Totals for entries with an activity
-    act_stmt = (
-        select(models.Activity.name, func.coalesce(func.sum(models.Entry.duration_minutes), 0))
-        .join(models.Entry, models.Entry.activity_id == models.Activity.id)
-        .where(models.Entry.date.between(start_date, end_date))
-        .group_by(models.Activity.id)
-        .having(func.coalesce(func.sum(models.Entry.duration_minutes), 0) > 0)
-        .order_by(func.sum(models.Entry.duration_minutes).desc())
-    )
-    results: List[Tuple[str, int]] = [(name, int(total or 0)) for name, total in db.execute(act_stmt).all()]
+def _get_settings_row(db: Session) -> models.Settings:
+    return db.get(models.Settings, 1)
 
-    # Totals for entries without an activity (unassigned)
-    unassigned_total = db.scalar(
-        select(func.coalesce(func.sum(models.Entry.duration_minutes), 0)).where(
-            models.Entry.activity_id.is_(None), models.Entry.date.between(start_date, end_date)
-        )
-    )
-    if unassigned_total and int(unassigned_total) > 0:
-        results.append(("Unassigned", int(unassigned_total)))
 
-    return results
+def invalidate_settings_cache() -> None:
+    global _settings_cache
+    _settings_cache = None
 
 
-# Settings
-def get_settings(db: Session) -> models.Settings:
-    settings = db.get(models.Settings, 1)
-    if settings is None:
-        settings = models.Settings(id=1)
-        db.add(settings)
-        db.commit()
-        db.refresh(settings)
-    return settings
+def get_settings(db: Session) -> schemas.SettingsRead:
+    global _settings_cache, _settings_cache_expires_at
+    now = time.monotonic()
+    if _settings_cache is None or now >= _settings_cache_expires_at:
+        _settings_cache = schemas.SettingsRead.from_orm_fast(_get_settings_row(db))
+        _settings_cache_expires_at = now + SETTINGS_CACHE_TTL_SECONDS
+    return _settings_cache
 
 
 def update_settings(db: Session, data: schemas.SettingsUpdate) -> models.Settings:
-    settings = get_settings(db)
+    settings = _get_settings_row(db)
     payload = data.model_dump()
     for field, value in payload.items():
         setattr(settings, field, value)
     db.commit()
-    db.refresh(settings)
+    invalidate_settings_cache()
     return settings
-
-
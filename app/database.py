@@ -3,7 +3,7 @@ from __future__ import annotations
 from pathlib import Path
 from typing import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
 
 
@@ -16,12 +16,84 @@ class Base(DeclarativeBase):
     pass
 
 
-# SQLite engine; check_same_thread disabled for FastAPI workers
+# SQLite engine; check_same_thread disabled for FastAPI workers. The pysqlite
+# dialect sets supports_statement_cache, so the CRUD layer's prebuilt statements
+# are compiled once and served from the cache sized below.
 engine = create_engine(
-    f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False}
+    f"sqlite:///{DB_PATH}",
+    connect_args={"check_same_thread": False},
+    query_cache_size=1200,
 )
 
-SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+# WAL lets readers run alongside the writer and, with synchronous=NORMAL, avoids an
+# fsync per commit; the larger page cache and mmap keep report scans in memory.
+SQLITE_PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "mmap_size=268435456",
+    "cache_size=-65536",
+    "temp_store=MEMORY",
+    "foreign_keys=ON",
+)
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _connection_record) -> None:
+    cursor = dbapi_conn.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
+# expire_on_commit=False keeps loaded attributes usable after commit instead of
+# forcing a reload; columns filled by the database still load lazily on access.
+SessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False, expire_on_commit=False)
+
+# Bump when the models change so init_db re-runs on existing databases. Missing
+# tables and indexes are created automatically; anything else (dropped indexes,
+# altered columns) needs a step in _SCHEMA_STEPS under the new version.
+SCHEMA_VERSION = 3
+
+# version -> SQL run once when an older database is upgraded to that version
+_SCHEMA_STEPS: dict[int, tuple[str, ...]] = {
+    # entries' (category|activity, date, duration) indexes replace the single-column ones
+    3: (
+        "DROP INDEX IF EXISTS ix_entries_category_id",
+        "DROP INDEX IF EXISTS ix_entries_activity_id",
+    ),
+}
+
+
+def _schema_version(conn) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar()
+
+
+def check_schema_version() -> None:
+    # One PRAGMA read, no reflection: refuse to serve a database init_db has not upgraded
+    with engine.connect() as conn:
+        current = _schema_version(conn)
+    if current < SCHEMA_VERSION:
+        raise RuntimeError(
+            f"Database schema is at version {current}, expected {SCHEMA_VERSION}; run `python -m app.initdb`"
+        )
+
+
+def init_db() -> None:
+    # PRAGMA user_version records the schema already applied, so normal boots skip
+    # create_all and its per-table reflection queries.
+    with engine.begin() as conn:
+        current = _schema_version(conn)
+        if current >= SCHEMA_VERSION:
+            return
+        Base.metadata.create_all(bind=conn)
+        # create_all skips the indexes of tables that already exist
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+        for version in range(current + 1, SCHEMA_VERSION + 1):
+            for statement in _SCHEMA_STEPS.get(version, ()):
+                conn.exec_driver_sql(statement)
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
 
 def get_db() -> Generator:
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+# Creates the schema and seeds default data; run once with `python -m app.initdb`
+
+from sqlalchemy import insert, select
+
+from . import crud, models
+from .database import SessionLocal, init_db
+
+
+def seed_defaults() -> None:
+    # One session and one transaction for all seeding; commits when the block exits
+    with SessionLocal() as db, db.begin():
+        # Seed a few default categories if database is empty
+        if not crud.list_categories_brief(db):
+            defaults = [
+                ("Exercise", "#DFF5E1"),
+                ("Reading", "#E0F2FF"),
+                ("Work", "#E6E0FF"),
+                ("Play", "#FFF4D6"),
+            ]
+            db.execute(insert(models.Category), [{"name": name, "color_hex": color} for name, color in defaults])
+
+        # Seed some common activities if none exist
+        if not crud.list_activities_brief(db):
+            cats = dict(db.execute(select(models.Category.name, models.Category.id)).all())
+            activity_defaults = [
+                ("Work", ["Coding", "Writing", "Meetings"]),
+                ("Exercise", ["Cardio", "Strength", "Yoga"]),
+                ("Reading", ["Fiction", "Non-fiction"]),
+                ("Play", ["Games", "Music", "Outdoors"]),
+            ]
+            act_rows = [
+                {"name": n, "category_id": cats[cat_name], "sort_order": idx}
+                for cat_name, names in activity_defaults
+                if cat_name in cats
+                for idx, n in enumerate(names)
+            ]
+            if act_rows:
+                db.execute(insert(models.Activity), act_rows)
+
+        crud.ensure_settings(db)
+        crud.ensure_daily_totals(db)
+
+
+def main() -> None:
+    init_db()
+    seed_defaults()
+
+
+if __name__ == "__main__":
+    main()
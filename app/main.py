@@ -1,35 +1,64 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+import csv
+import io
+import os
+from datetime import date, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Tuple
 
 from fastapi import Depends, FastAPI, HTTPException, Request, Form
 from fastapi.responses import HTMLResponse, RedirectResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
 
-from .database import Base, engine, get_db
-from . import crud, models, schemas
-from .utils.time_utils import round_minutes
+from .database import BASE_DIR, SessionLocal, check_schema_version, get_db
+from . import crud, initdb, schema_warmup, schemas
+from .utils.time_utils import get_rounder
 
 
 app = FastAPI(title="Pastel Time Tracker", version="0.1.0")
 
-# Create tables on startup if they don't exist
-Base.metadata.create_all(bind=engine)
+# Jinja2 setup; templates are only re-checked on disk in dev mode (PASTEL_DEV=1),
+# and compiled bytecode is cached across restarts.
+TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+JINJA_CACHE_DIR = BASE_DIR / ".jinja_cache"
+DEV_MODE = os.environ.get("PASTEL_DEV") == "1"
+
+
+def _template_bytecode_cache() -> Optional[FileSystemBytecodeCache]:
+    # The source tree may be read-only when deployed; fall back to Jinja's per-user
+    # temp directory, and failing that run without a bytecode cache
+    try:
+        JINJA_CACHE_DIR.mkdir(exist_ok=True)
+    except OSError:
+        pass
+    else:
+        if os.access(JINJA_CACHE_DIR, os.W_OK):
+            return FileSystemBytecodeCache(directory=str(JINJA_CACHE_DIR))
+    try:
+        return FileSystemBytecodeCache()
+    except (OSError, RuntimeError):
+        return None
 
 
-# Jinja2 setup
-TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
 jinja_env = Environment(
     loader=FileSystemLoader(str(TEMPLATES_DIR)),
     autoescape=select_autoescape(["html", "xml"]),
+    auto_reload=DEV_MODE,
+    bytecode_cache=_template_bytecode_cache(),
 )
 
 
-def render_template(template_name: str, **context) -> HTMLResponse:
+# Template output is grouped into chunks of this many rendered fragments per send
+TEMPLATE_STREAM_BUFFER = 64
+
+
+def render_template(template_name: str, **context) -> StreamingResponse:
     # Inject settings for theming
     try:
         db: Optional[Session] = context.get("db")
@@ -38,7 +67,11 @@ def render_template(template_name: str, **context) -> HTMLResponse:
         settings = None
     context.setdefault("settings", settings)
     template = jinja_env.get_template(template_name)
-    return HTMLResponse(template.render(**context))
+    # Rendered lazily while the body is sent, so the context must already be loaded:
+    # the request session may be closed by then and lazy loads would fail.
+    stream = template.stream(**context)
+    stream.enable_buffering(TEMPLATE_STREAM_BUFFER)
+    return StreamingResponse((chunk.encode("utf-8") for chunk in stream), media_type="text/html")
 
 
 # Static files
@@ -47,55 +80,58 @@ app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 
 
 def get_today() -> date:
-    return datetime.now().date()
+    return date.today()
+
+
+# Range helpers are memoized so the summary and chart views share the date math
+@lru_cache(maxsize=32)
+def _week_range(today: date, start_mode: str) -> Tuple[date, date]:
+    # Monday=0, Sunday handling
+    weekday = today.weekday()
+    if start_mode == "sunday":
+        # compute days since Sunday
+        days_since_sun = (weekday + 1) % 7
+        start = today - timedelta(days=days_since_sun)
+    else:
+        start = today - timedelta(days=weekday)
+    return start, start + timedelta(days=6)
+
+
+@lru_cache(maxsize=32)
+def _month_range(day: date) -> Tuple[date, date]:
+    start = date(day.year, day.month, 1)
+    if start.month == 12:
+        next_month = date(start.year + 1, 1, 1)
+    else:
+        next_month = date(start.year, start.month + 1, 1)
+    return start, next_month - timedelta(days=1)
 
 
 @app.on_event("startup")
-def seed_defaults() -> None:
-    # Seed a few default categories if database is empty
-    with next(get_db()) as db:  # type: ignore
-        if not crud.list_categories(db):
-            defaults = [
-                ("Exercise", "#DFF5E1"),
-                ("Reading", "#E0F2FF"),
-                ("Work", "#E6E0FF"),
-                ("Play", "#FFF4D6"),
-            ]
-            for name, color in defaults:
-                crud.create_category(db, schemas.CategoryCreate(name=name, color_hex=color))
-
-        # Seed some common activities if none exist
-        if not crud.list_activities(db):
-            cats = {c.name: c for c in crud.list_categories(db)}
-            activity_defaults = [
-                ("Work", ["Coding", "Writing", "Meetings"]),
-                ("Exercise", ["Cardio", "Strength", "Yoga"]),
-                ("Reading", ["Fiction", "Non-fiction"]),
-                ("Play", ["Games", "Music", "Outdoors"]),
-            ]
-            for cat_name, names in activity_defaults:
-                cat = cats.get(cat_name)
-                if not cat:
-                    continue
-                for idx, n in enumerate(names):
-                    try:
-                        crud.create_activity(db, schemas.ActivityCreate(name=n, category_id=cat.id, sort_order=idx))
-                    except Exception:
-                        pass
+def warm_up_schemas() -> None:
+    schema_warmup.warm_up_schemas()
+
+
+@app.on_event("startup")
+def init_on_startup() -> None:
+    # Schema setup normally runs once via `python -m app.initdb`; PASTEL_INIT_DB opts in here
+    if "PASTEL_INIT_DB" in os.environ:
+        initdb.main()
+    else:
+        check_schema_version()
 
 
 @app.get("/", response_class=HTMLResponse)
-def index(request: Request, db: Session = Depends(get_db)) -> HTMLResponse:
+def index(request: Request, db: Session = Depends(get_db)) -> StreamingResponse:
     today = get_today()
-    entries = crud.list_entries(db, date_from=today, date_to=today)
-    categories = crud.list_categories(db)
-    activities = crud.list_activities(db)
+    entries = crud.list_entries(db, date_from=today, date_to=today, eager=True)
+    # The activity dropdown carries category_name, so no separate category query
+    activities = crud.list_activities_brief(db)
     return render_template(
         "index.html",
         request=request,
         today=today,
         entries=entries,
-        categories=categories,
         activities=activities,
         db=db,
     )
@@ -111,14 +147,15 @@ def add_entry(
 ):
     try:
         settings = crud.get_settings(db)
-        duration_minutes = round_minutes(duration_minutes, settings.rounding_mode, settings.rounding_increment)
+        rounder = get_rounder(settings.rounding_mode, settings.rounding_increment)
+        duration_minutes = rounder(duration_minutes)
         # Derive category from activity
-        act = crud.get_activity(db, activity_id)
-        if not act:
+        category_id = crud.get_activity_category_id(db, activity_id)
+        if category_id is None:
             raise ValueError("Activity not found")
         payload = schemas.EntryCreate(
             date=date.fromisoformat(date_value),
-            category_id=act.category_id,
+            category_id=category_id,
             activity_id=activity_id,
             duration_minutes=duration_minutes,
             notes=notes,
@@ -138,13 +175,12 @@ def delete_entry(entry_id: int = Form(...), db: Session = Depends(get_db)):
 
 
 @app.get("/weekly", response_class=HTMLResponse)
-def weekly_view(week_of: Optional[str] = None, db: Session = Depends(get_db)) -> HTMLResponse:
-    today = get_today()
+def weekly_view(week_of: Optional[str] = None, db: Session = Depends(get_db)) -> StreamingResponse:
     if week_of:
         start = date.fromisoformat(week_of)
     else:
         # find week start (Mon)
-        start = today - timedelta(days=today.weekday())
+        start, _ = _week_range(get_today(), "monday")
     cat_rows, act_rows = crud.weekly_totals(db, start)
     return render_template(
         "weekly.html",
@@ -156,19 +192,12 @@ def weekly_view(week_of: Optional[str] = None, db: Session = Depends(get_db)) ->
 
 
 @app.get("/monthly", response_class=HTMLResponse)
-def monthly_view(month: Optional[str] = None, db: Session = Depends(get_db)) -> HTMLResponse:
-    today = get_today()
+def monthly_view(month: Optional[str] = None, db: Session = Depends(get_db)) -> StreamingResponse:
     if month:
         year, mon = [int(x) for x in month.split("-")]
-        start = date(year, mon, 1)
+        start, end = _month_range(date(year, mon, 1))
     else:
-        start = date(today.year, today.month, 1)
-
-    if start.month == 12:
-        next_month = date(start.year + 1, 1, 1)
-    else:
-        next_month = date(start.year, start.month + 1, 1)
-    end = next_month - timedelta(days=1)
+        start, end = _month_range(get_today())
 
     cat_rows, act_rows = crud.monthly_totals(db, start, end)
     return render_template(
@@ -181,15 +210,20 @@ def monthly_view(month: Optional[str] = None, db: Session = Depends(get_db)) ->
 
 
 @app.get("/manage/categories", response_class=HTMLResponse)
-def manage_categories(db: Session = Depends(get_db)) -> HTMLResponse:
+def manage_categories(db: Session = Depends(get_db)) -> StreamingResponse:
     categories = crud.list_categories(db)
     return render_template("manage_categories.html", categories=categories, db=db)
 
 
 @app.post("/manage/categories/add")
 def add_category(name: str = Form(...), color_hex: str = Form("#E6E0FF"), icon_key: Optional[str] = Form(None), db: Session = Depends(get_db)):
-    payload = schemas.CategoryCreate(name=name, color_hex=color_hex, icon_key=icon_key)
-    crud.create_category(db, payload)
+    try:
+        payload = schemas.CategoryCreate(name=name, color_hex=color_hex, icon_key=icon_key)
+        crud.create_category(db, payload)
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except IntegrityError:
+        raise HTTPException(status_code=400, detail="Category name already exists")
     return RedirectResponse(url="/manage/categories", status_code=303)
 
 
@@ -202,14 +236,14 @@ def delete_category(category_id: int = Form(...), db: Session = Depends(get_db))
 
 
 @app.get("/manage/activities", response_class=HTMLResponse)
-def manage_activities(category_id: Optional[int] = None, db: Session = Depends(get_db)) -> HTMLResponse:
-    categories = crud.list_categories(db)
-    activities = crud.list_activities(db, category_id=category_id)
+def manage_activities(category_id: Optional[int] = None, db: Session = Depends(get_db)) -> StreamingResponse:
+    categories = crud.list_categories_brief(db)
+    activities = crud.list_activities_brief(db, category_id=category_id)
     return render_template("manage_activities.html", categories=categories, activities=activities, selected_category_id=category_id, db=db)
 
 
 @app.get("/settings", response_class=HTMLResponse)
-def settings_page(db: Session = Depends(get_db)) -> HTMLResponse:
+def settings_page(db: Session = Depends(get_db)) -> StreamingResponse:
     settings = crud.get_settings(db)
     return render_template("settings.html", settings=settings, db=db)
 
@@ -225,23 +259,32 @@ def update_settings(
     glass_blur_px: int = Form(12),
     db: Session = Depends(get_db),
 ):
-    payload = schemas.SettingsUpdate(
-        rounding_mode=rounding_mode,
-        rounding_increment=rounding_increment,
-        week_start=week_start,
-        primary_hex=primary_hex,
-        accent_hex=accent_hex,
-        glass_alpha=glass_alpha,
-        glass_blur_px=glass_blur_px,
-    )
+    try:
+        payload = schemas.SettingsUpdate(
+            rounding_mode=rounding_mode,
+            rounding_increment=rounding_increment,
+            week_start=week_start,
+            primary_hex=primary_hex,
+            accent_hex=accent_hex,
+            glass_alpha=glass_alpha,
+            glass_blur_px=glass_blur_px,
+        )
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     crud.update_settings(db, payload)
     return RedirectResponse(url="/settings", status_code=303)
 
 
 @app.post("/manage/activities/add")
 def add_activity(name: str = Form(...), category_id: int = Form(...), db: Session = Depends(get_db)):
-    payload = schemas.ActivityCreate(name=name, category_id=category_id)
-    crud.create_activity(db, payload)
+    try:
+        payload = schemas.ActivityCreate(name=name, category_id=category_id)
+        crud.create_activity(db, payload)
+    except ValidationError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    except IntegrityError:
+        # Unknown category (foreign keys are enforced) or a duplicate name within it
+        raise HTTPException(status_code=400, detail="Category not found or activity already exists")
     return RedirectResponse(url=f"/manage/activities?category_id={category_id}", status_code=303)
 
 
@@ -257,70 +300,49 @@ def delete_activity(activity_id: int = Form(...), category_id: int = Form(...),
 def export_csv(
     from_date: Optional[str] = None,
     to_date: Optional[str] = None,
-    db: Session = Depends(get_db),
 ):
     d_from = date.fromisoformat(from_date) if from_date else None
     d_to = date.fromisoformat(to_date) if to_date else None
-    # Materialize data to avoid lazy-load after session closes
-    rows = []
-    for e in crud.list_entries(db, date_from=d_from, date_to=d_to):
-        rows.append(
-            (
-                e.id,
-                str(e.date),
-                e.category.name if e.category else "",
-                e.activity.name if e.activity else "",
-                e.duration_minutes,
-                (e.notes or "").replace("\n", " ").replace(",", " "),
-            )
-        )
 
     def iter_rows():
-        yield "id,date,category,activity,duration_minutes,notes\n"
-        for r in rows:
-            yield f"{r[0]},{r[1]},{r[2]},{r[3]},{r[4]},{r[5]}\n"
+        # Own session: the request-scoped one is closed before the body streams
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(["id", "date", "category", "activity", "duration_minutes", "notes"])
+        yield buffer.getvalue()
+        db = SessionLocal()
+        try:
+            for rows in crud.export_entry_rows(db, date_from=d_from, date_to=d_to):
+                buffer.seek(0)
+                buffer.truncate()
+                writer.writerows(rows)
+                yield buffer.getvalue()
+        finally:
+            db.close()
 
     filename = "time_entries.csv"
     headers = {"Content-Disposition": f"attachment; filename={filename}"}
     return StreamingResponse(iter_rows(), media_type="text/csv", headers=headers)
 
 
-def _week_range(today: date, start_mode: str) -> date:
-    # Monday=0, Sunday handling
-    weekday = today.weekday()
-    if start_mode == "sunday":
-        # compute days since Sunday
-        days_since_sun = (weekday + 1) % 7
-        return today - timedelta(days=days_since_sun)
-    return today - timedelta(days=weekday)
-
-
 @app.get("/charts/daily", response_class=HTMLResponse)
-def charts_daily(db: Session = Depends(get_db)) -> HTMLResponse:
+def charts_daily(db: Session = Depends(get_db)) -> StreamingResponse:
     today = get_today()
     data = crud.activity_totals_in_range(db, today, today)
     return render_template("chart_pie.html", title="Daily Activity Breakdown", chart_data=data, db=db)
 
 
 @app.get("/charts/weekly", response_class=HTMLResponse)
-def charts_weekly(db: Session = Depends(get_db)) -> HTMLResponse:
-    today = get_today()
+def charts_weekly(db: Session = Depends(get_db)) -> StreamingResponse:
     settings = crud.get_settings(db)
-    start = _week_range(today, settings.week_start)
-    end = start + timedelta(days=6)
+    start, end = _week_range(get_today(), settings.week_start)
     data = crud.activity_totals_in_range(db, start, end)
     return render_template("chart_pie.html", title="Weekly Activity Breakdown", chart_data=data, db=db)
 
 
 @app.get("/charts/monthly", response_class=HTMLResponse)
-def charts_monthly(db: Session = Depends(get_db)) -> HTMLResponse:
-    today = get_today()
-    start = date(today.year, today.month, 1)
-    if start.month == 12:
-        next_month = date(start.year + 1, 1, 1)
-    else:
-        next_month = date(start.year, start.month + 1, 1)
-    end = next_month - timedelta(days=1)
+def charts_monthly(db: Session = Depends(get_db)) -> StreamingResponse:
+    start, end = _month_range(get_today())
     data = crud.activity_totals_in_range(db, start, end)
     return render_template("chart_pie.html", title="Monthly Activity Breakdown", chart_data=data, db=db)
 
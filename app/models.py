@@ -1,24 +1,54 @@
 from __future__ import annotations
 
-from datetime import datetime, date
+from datetime import datetime, date, timezone
 from typing import List, Optional
 
 from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    cast,
     func,
 )
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .database import Base
 
 
-class Category(Base):
+def _epoch_seconds(value: datetime) -> int:
+    # SQLite CURRENT_TIMESTAMP values are naive UTC
+    return int(value.replace(tzinfo=timezone.utc).timestamp())
+
+
+class EpochTimestampsMixin:
+    """Integer epoch-second views of created_at/updated_at for serialization."""
+
+    @hybrid_property
+    def created_at_ts(self) -> int:
+        return _epoch_seconds(self.created_at)
+
+    @created_at_ts.inplace.expression
+    @classmethod
+    def _created_at_ts_expression(cls):
+        return cast(func.strftime("%s", cls.created_at), Integer)
+
+    @hybrid_property
+    def updated_at_ts(self) -> int:
+        return _epoch_seconds(self.updated_at)
+
+    @updated_at_ts.inplace.expression
+    @classmethod
+    def _updated_at_ts_expression(cls):
+        return cast(func.strftime("%s", cls.updated_at), Integer)
+
+
+class Category(EpochTimestampsMixin, Base):
     __tablename__ = "categories"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
@@ -35,7 +65,7 @@ class Category(Base):
     entries: Mapped[List["Entry"]] = relationship("Entry", back_populates="category")
 
 
-class Activity(Base):
+class Activity(EpochTimestampsMixin, Base):
     __tablename__ = "activities"
     __table_args__ = (UniqueConstraint("category_id", "name", name="uq_activity_per_category"),)
 
@@ -52,15 +82,23 @@ class Activity(Base):
     entries: Mapped[List["Entry"]] = relationship("Entry", back_populates="activity")
 
 
-class Entry(Base):
+class Entry(EpochTimestampsMixin, Base):
     __tablename__ = "entries"
+    # Reports read daily_totals, so these serve as the foreign-key indexes: their
+    # leading column answers the in-use EXISTS checks and SQLite's ON DELETE RESTRICT
+    # lookups. The trailing duration lets rebuild_daily_totals aggregate from
+    # ix_entries_cat_date alone, without visiting the table rows.
+    __table_args__ = (
+        Index("ix_entries_cat_date", "category_id", "date", "duration_minutes"),
+        Index("ix_entries_act_date", "activity_id", "date", "duration_minutes"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     activity_id: Mapped[Optional[int]] = mapped_column(
-        ForeignKey("activities.id", ondelete="RESTRICT"), nullable=True, index=True
+        ForeignKey("activities.id", ondelete="RESTRICT"), nullable=True
     )
     category_id: Mapped[int] = mapped_column(
-        ForeignKey("categories.id", ondelete="RESTRICT"), nullable=False, index=True
+        ForeignKey("categories.id", ondelete="RESTRICT"), nullable=False
     )
     date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
     duration_minutes: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -74,6 +112,19 @@ class Entry(Base):
     category: Mapped[Category] = relationship("Category", back_populates="entries")
 
 
+class DailyTotal(Base):
+    """Per-day rollup of entry minutes, maintained by the CRUD layer on every entry write."""
+
+    __tablename__ = "daily_totals"
+
+    # Derived data, so no foreign keys; activity_id 0 stands for "unassigned" so the
+    # composite key stays unique (SQLite treats NULLs as distinct).
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    category_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    activity_id: Mapped[int] = mapped_column(Integer, primary_key=True, default=0)
+    total_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
 class Settings(Base):
     __tablename__ = "settings"
 
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from . import schemas
+
+# Every schema declared with defer_build; built once at startup so the first
+# request does not pay for it
+DEFERRED_SCHEMAS = (
+    schemas.CategoryBase,
+    schemas.CategoryUpdate,
+    schemas.CategoryRead,
+    schemas.ActivityBase,
+    schemas.ActivityUpdate,
+    schemas.ActivityRead,
+    schemas.EntryBase,
+    schemas.EntryUpdate,
+    schemas.EntryRead,
+    schemas.CategoryTotal,
+    schemas.ActivityTotal,
+    schemas.SettingsRead,
+    schemas.SettingsUpdate,
+)
+
+
+def warm_up_schemas() -> None:
+    for model in DEFERRED_SCHEMAS:
+        model.model_rebuild()
@@ -1,104 +1,140 @@
 from __future__ import annotations
 
-from datetime import date, datetime
-from typing import Optional, List
+import datetime
+import operator
+from typing import Annotated, Any, Callable, Literal
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field
+
+from .utils.time_utils import MAX_DAY_MINUTES
+
+
+# Constrained types; pydantic-core compiles the pattern once and checks literals natively
+HEX_COLOR_PATTERN = r"^#[0-9A-Fa-f]{6}$"
+HexColor = Annotated[str, Field(pattern=HEX_COLOR_PATTERN)]
+RoundingMode = Literal["none", "up", "down", "nearest"]
+WeekStart = Literal["monday", "sunday"]
+CategoryName = Annotated[str, Field(min_length=1, max_length=100)]
+ActivityName = Annotated[str, Field(min_length=1, max_length=120)]
+Duration = Annotated[int, Field(gt=0, le=MAX_DAY_MINUTES)]
+
+
+# Per Read class: its field names and one attrgetter over them
+_ORM_FIELD_GETTERS: dict[type, tuple[tuple[str, ...], Callable[[Any], tuple]]] = {}
+
+
+# Read schemas are built from database rows that are already valid, so they skip
+# validation; model_validate stays the path for HTTP input (*Create / *Update).
+# Every schema uses defer_build: validators are built on first use or by
+# schema_warmup at app startup, keeping this module cheap to import. Read
+# schemas are also frozen and forbid extras, since nothing mutates them.
+class TrustedRead(BaseModel):
+    @classmethod
+    def from_orm_fast(cls, obj):
+        # One C-level attrgetter call pulls every field; built once per Read class
+        spec = _ORM_FIELD_GETTERS.get(cls)
+        if spec is None:
+            fields = tuple(cls.model_fields)
+            spec = _ORM_FIELD_GETTERS[cls] = (fields, operator.attrgetter(*fields))
+        fields, getter = spec
+        return cls.model_construct(**dict(zip(fields, getter(obj))))
 
 
 # Category Schemas
 class CategoryBase(BaseModel):
-    name: str = Field(min_length=1, max_length=100)
-    color_hex: str = Field(default="#E6E0FF")
-    icon_key: Optional[str] = None
+    model_config = ConfigDict(defer_build=True)
+
+    name: CategoryName
+    color_hex: HexColor = "#E6E0FF"
+    icon_key: str | None = None
     sort_order: int = 0
 
 
-class CategoryCreate(CategoryBase):
-    pass
+# Identical to the base, so share its validator instead of building another
+CategoryCreate = CategoryBase
 
 
 class CategoryUpdate(BaseModel):
-    name: Optional[str] = Field(default=None, min_length=1, max_length=100)
-    color_hex: Optional[str] = None
-    icon_key: Optional[str] = None
-    sort_order: Optional[int] = None
+    model_config = ConfigDict(defer_build=True)
 
+    name: CategoryName | None = None
+    color_hex: HexColor | None = None
+    icon_key: str | None = None
+    sort_order: int | None = None
 
-class CategoryRead(CategoryBase):
-    id: int
-    created_at: datetime
-    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+class CategoryRead(CategoryBase, TrustedRead):
+    model_config = ConfigDict(from_attributes=True, defer_build=True, frozen=True, extra="forbid")
+
+    id: int
+    created_at_ts: int
+    updated_at_ts: int
 
 
 # Activity Schemas
 class ActivityBase(BaseModel):
-    name: str = Field(min_length=1, max_length=120)
+    model_config = ConfigDict(defer_build=True)
+
+    name: ActivityName
     category_id: int
     sort_order: int = 0
 
 
-class ActivityCreate(ActivityBase):
-    pass
+ActivityCreate = ActivityBase
 
 
 class ActivityUpdate(BaseModel):
-    name: Optional[str] = Field(default=None, min_length=1, max_length=120)
-    category_id: Optional[int] = None
-    sort_order: Optional[int] = None
+    model_config = ConfigDict(defer_build=True)
 
+    name: ActivityName | None = None
+    category_id: int | None = None
+    sort_order: int | None = None
 
-class ActivityRead(ActivityBase):
-    id: int
-    created_at: datetime
-    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+class ActivityRead(ActivityBase, TrustedRead):
+    model_config = ConfigDict(from_attributes=True, defer_build=True, frozen=True, extra="forbid")
+
+    id: int
+    created_at_ts: int
+    updated_at_ts: int
 
 
 # Entry Schemas
 class EntryBase(BaseModel):
-    date: date
-    duration_minutes: int = Field(gt=0, le=24 * 60)
-    category_id: int
-    activity_id: Optional[int] = None
-    notes: Optional[str] = None
+    model_config = ConfigDict(defer_build=True)
 
-    @field_validator("duration_minutes")
-    @classmethod
-    def validate_duration(cls, v: int) -> int:
-        if v <= 0:
-            raise ValueError("Duration must be positive")
-        return v
+    date: datetime.date
+    duration_minutes: Duration
+    category_id: int
+    activity_id: int | None = None
+    notes: str | None = None
 
 
-class EntryCreate(EntryBase):
-    pass
+EntryCreate = EntryBase
 
 
 class EntryUpdate(BaseModel):
-    date: Optional[date] = None
-    duration_minutes: Optional[int] = Field(default=None, gt=0, le=24 * 60)
-    category_id: Optional[int] = None
-    activity_id: Optional[int] = None
-    notes: Optional[str] = None
+    model_config = ConfigDict(defer_build=True)
 
+    date: datetime.date | None = None
+    duration_minutes: Duration | None = None
+    category_id: int | None = None
+    activity_id: int | None = None
+    notes: str | None = None
 
-class EntryRead(EntryBase):
-    id: int
-    created_at: datetime
-    updated_at: datetime
 
-    class Config:
-        from_attributes = True
+class EntryRead(EntryBase, TrustedRead):
+    model_config = ConfigDict(from_attributes=True, defer_build=True, frozen=True, extra="forbid")
+
+    id: int
+    created_at_ts: int
+    updated_at_ts: int
 
 
 # Report Schemas
 class CategoryTotal(BaseModel):
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     category_id: int
     category_name: str
     category_color: str
@@ -106,33 +142,34 @@ class CategoryTotal(BaseModel):
 
 
 class ActivityTotal(BaseModel):
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     activity_id: int
     activity_name: str
     category_id: int
     total_minutes: int
 
 
-class SettingsRead(BaseModel):
+class SettingsRead(TrustedRead):
+    model_config = ConfigDict(from_attributes=True, defer_build=True, frozen=True, extra="forbid")
+
     id: int
-    rounding_mode: str
+    rounding_mode: RoundingMode
     rounding_increment: int
-    week_start: str
-    primary_hex: str
-    accent_hex: str
+    week_start: WeekStart
+    primary_hex: HexColor
+    accent_hex: HexColor
     glass_alpha: int
     glass_blur_px: int
 
-    class Config:
-        from_attributes = True
-
 
 class SettingsUpdate(BaseModel):
-    rounding_mode: str
+    model_config = ConfigDict(defer_build=True)
+
+    rounding_mode: RoundingMode
     rounding_increment: int
-    week_start: str
-    primary_hex: str
-    accent_hex: str
+    week_start: WeekStart
+    primary_hex: HexColor
+    accent_hex: HexColor
     glass_alpha: int
     glass_blur_px: int
-
-
@@ -1,17 +1,38 @@
 from __future__ import annotations
 
-def round_minutes(value: int, mode: str, increment: int) -> int:
+from typing import Callable, Dict, Tuple
+
+MAX_DAY_MINUTES = 24 * 60
+
+Rounder = Callable[[int], int]
+
+# Settings change rarely, so each (mode, increment) pair gets one prebuilt closure;
+# the cardinality is bounded by the handful of values ever saved.
+_ROUNDER_CACHE: Dict[Tuple[str, int], Rounder] = {}
+
+
+def make_rounder(mode: str, increment: int) -> Rounder:
+    # Returns a closure specialized to one mode: no mode dispatch per call, inc and
+    # half are cell variables, and the 1-minute floor is a compare, not a max() call.
     if increment <= 0 or mode == "none":
-        return max(1, value)
-    inc = max(1, int(increment))
-    q, r = divmod(value, inc)
-    if r == 0:
-        return value
+        return lambda value: 1 if value < 1 else value
+    inc = increment
+    half = inc >> 1
     if mode == "down":
-        return max(1, q * inc)
+        return lambda value: 1 if value < inc else value // inc * inc
     if mode == "up":
-        return (q + 1) * inc
-    # nearest
-    return (q + (1 if r >= inc / 2 else 0)) * inc
+        return lambda value: (value + inc - 1) // inc * inc
+    # nearest (and unknown modes); halves round up, matching r >= inc / 2
+    return lambda value: (value + half) // inc * inc
+
 
+def get_rounder(mode: str, increment: int) -> Rounder:
+    key = (mode, increment)
+    rounder = _ROUNDER_CACHE.get(key)
+    if rounder is None:
+        rounder = _ROUNDER_CACHE[key] = make_rounder(mode, increment)
+    return rounder
 
+
+def round_minutes(value: int, mode: str, increment: int) -> int:
+    return get_rounder(mode, increment)(value)
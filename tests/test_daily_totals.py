@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import datetime
+import random
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, schemas
+from app.database import Base
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def activities(db):
+    rows = []
+    for name in ("Work", "Reading"):
+        category = crud.create_category(db, schemas.CategoryCreate(name=name))
+        for activity_name in ("A", "B"):
+            rows.append(crud.create_activity(db, schemas.ActivityCreate(name=activity_name, category_id=category.id)))
+    return rows
+
+
+def _rollup(db) -> dict:
+    # Rows whose entries were all removed stay behind at zero; reports ignore them
+    rows = db.execute(
+        select(
+            models.DailyTotal.date,
+            models.DailyTotal.category_id,
+            models.DailyTotal.activity_id,
+            models.DailyTotal.total_minutes,
+        ).where(models.DailyTotal.total_minutes != 0)
+    )
+    return {tuple(row[:3]): row[3] for row in rows}
+
+
+def _grouped_entries(db) -> dict:
+    key = (models.Entry.date, models.Entry.category_id, func.coalesce(models.Entry.activity_id, 0))
+    rows = db.execute(select(*key, func.sum(models.Entry.duration_minutes)).group_by(*key))
+    return {tuple(row[:3]): row[3] for row in rows}
+
+
+def test_rollup_tracks_entry_writes(db, activities):
+    rng = random.Random(7)
+    day0 = datetime.date(2024, 3, 1)
+
+    def random_fields() -> dict:
+        activity = rng.choice(activities + [None])
+        category_id = activity.category_id if activity else rng.choice(activities).category_id
+        return {
+            "date": day0 + datetime.timedelta(days=rng.randint(0, 20)),
+            "category_id": category_id,
+            "activity_id": activity.id if activity else None,
+            "duration_minutes": rng.randint(1, 240),
+        }
+
+    entry_ids = [crud.create_entry(db, schemas.EntryCreate(**random_fields())).id for _ in range(120)]
+    assert _rollup(db) == _grouped_entries(db)
+
+    for entry_id in rng.sample(entry_ids, 40):
+        crud.update_entry(db, entry_id, schemas.EntryUpdate(**random_fields()))
+    for entry_id in rng.sample(entry_ids, 10):
+        # Partial updates leave the other rollup key columns in place
+        crud.update_entry(db, entry_id, schemas.EntryUpdate(duration_minutes=rng.randint(1, 240)))
+    assert _rollup(db) == _grouped_entries(db)
+
+    for entry_id in rng.sample(entry_ids, 50):
+        assert crud.delete_entry(db, entry_id)
+    assert _rollup(db) == _grouped_entries(db)
+
+
+def test_rejected_update_leaves_rollup_unchanged(db, activities):
+    work_a, _, reading_a, _ = activities
+    entry = crud.create_entry(
+        db,
+        schemas.EntryCreate(
+            date=datetime.date(2024, 3, 1),
+            category_id=work_a.category_id,
+            activity_id=work_a.id,
+            duration_minutes=30,
+        ),
+    )
+    with pytest.raises(ValueError):
+        crud.update_entry(db, entry.id, schemas.EntryUpdate(activity_id=reading_a.id))
+    db.rollback()
+    assert _rollup(db) == _grouped_entries(db)
+
+
+def test_rebuild_matches_incremental(db, activities):
+    for offset, activity in enumerate(activities):
+        crud.create_entry(
+            db,
+            schemas.EntryCreate(
+                date=datetime.date(2024, 3, 1) + datetime.timedelta(days=offset % 2),
+                category_id=activity.category_id,
+                activity_id=activity.id if offset % 3 else None,
+                duration_minutes=15 * (offset + 1),
+            ),
+        )
+    incremental = _rollup(db)
+    crud.rebuild_daily_totals(db)
+    db.commit()
+    assert _rollup(db) == incremental == _grouped_entries(db)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import datetime
+
+import pytest
+from sqlalchemy import create_engine, func, insert, inspect, select
+from sqlalchemy.orm import sessionmaker
+
+from app import database, initdb, models
+from app.database import SCHEMA_VERSION, Base
+
+
+@pytest.fixture
+def engine(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    monkeypatch.setattr(database, "engine", engine)
+    monkeypatch.setattr(initdb, "SessionLocal", sessionmaker(bind=engine, autoflush=False, expire_on_commit=False))
+    yield engine
+    engine.dispose()
+
+
+def _create_legacy_schema(engine) -> None:
+    # Tables as the pre-rollup release created them: single-column FK indexes on
+    # entries, no composite indexes, no daily_totals and user_version left at 0
+    tables = [table for table in Base.metadata.sorted_tables if table.name != "daily_totals"]
+    Base.metadata.create_all(bind=engine, tables=tables)
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_entries_cat_date")
+        conn.exec_driver_sql("DROP INDEX ix_entries_act_date")
+        conn.exec_driver_sql("CREATE INDEX ix_entries_category_id ON entries (category_id)")
+        conn.exec_driver_sql("CREATE INDEX ix_entries_activity_id ON entries (activity_id)")
+        conn.execute(insert(models.Category), [{"id": 1, "name": "Work"}, {"id": 2, "name": "Reading"}])
+        conn.execute(
+            insert(models.Activity),
+            [{"id": 1, "category_id": 1, "name": "Coding"}, {"id": 2, "category_id": 2, "name": "Fiction"}],
+        )
+        day = datetime.date(2024, 3, 1)
+        conn.execute(
+            insert(models.Entry),
+            [
+                {"date": day, "category_id": 1, "activity_id": 1, "duration_minutes": 30},
+                {"date": day, "category_id": 1, "activity_id": 1, "duration_minutes": 45},
+                {"date": day, "category_id": 1, "activity_id": None, "duration_minutes": 15},
+                {"date": day + datetime.timedelta(days=1), "category_id": 2, "activity_id": 2, "duration_minutes": 60},
+            ],
+        )
+        assert conn.exec_driver_sql("PRAGMA user_version").scalar() == 0
+
+
+def test_initdb_upgrades_legacy_database(engine):
+    _create_legacy_schema(engine)
+
+    initdb.main()
+
+    inspector = inspect(engine)
+    entry_indexes = {index["name"] for index in inspector.get_indexes("entries")}
+    assert {"ix_entries_cat_date", "ix_entries_act_date"} <= entry_indexes
+    assert not {"ix_entries_category_id", "ix_entries_activity_id"} & entry_indexes
+    assert inspector.has_table("daily_totals")
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA user_version").scalar() == SCHEMA_VERSION == 3
+        key = (models.Entry.date, models.Entry.category_id, func.coalesce(models.Entry.activity_id, 0))
+        grouped = conn.execute(select(*key, func.sum(models.Entry.duration_minutes)).group_by(*key)).all()
+        rollup = conn.execute(
+            select(
+                models.DailyTotal.date,
+                models.DailyTotal.category_id,
+                models.DailyTotal.activity_id,
+                models.DailyTotal.total_minutes,
+            )
+        ).all()
+    assert sorted(rollup) == sorted(grouped)
+
+
+def test_initdb_is_a_no_op_once_current(engine):
+    _create_legacy_schema(engine)
+    initdb.main()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE INDEX ix_entries_category_id ON entries (category_id)")
+
+    # The version gate returns before any upgrade step runs again
+    database.init_db()
+
+    entry_indexes = {index["name"] for index in inspect(engine).get_indexes("entries")}
+    assert "ix_entries_category_id" in entry_indexes
+
+
+def test_schema_check_rejects_outdated_database(engine):
+    _create_legacy_schema(engine)
+    with pytest.raises(RuntimeError, match="python -m app.initdb"):
+        database.check_schema_version()
+
+    initdb.main()
+    database.check_schema_version()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+from app.utils.time_utils import MAX_DAY_MINUTES, get_rounder, round_minutes
+
+INCREMENTS = (-15, -1, 0, *range(1, 121))
+DURATIONS = range(1, MAX_DAY_MINUTES + 1)
+
+
+def _reference_round(value: int, mode: str, increment: int) -> int:
+    # The original divmod implementation the closures replaced
+    if increment <= 0 or mode == "none":
+        return max(1, value)
+    inc = max(1, int(increment))
+    q, r = divmod(value, inc)
+    if r == 0:
+        return value
+    if mode == "down":
+        return max(1, q * inc)
+    if mode == "up":
+        return (q + 1) * inc
+    return (q + (1 if r >= inc / 2 else 0)) * inc
+
+
+@pytest.mark.parametrize("mode", ["none", "up", "down", "nearest", "unknown"])
+def test_rounding_matches_reference(mode):
+    for increment in INCREMENTS:
+        rounder = get_rounder(mode, increment)
+        for value in DURATIONS:
+            expected = _reference_round(value, mode, increment)
+            assert rounder(value) == expected, (mode, increment, value)
+            assert round_minutes(value, mode, increment) == expected, (mode, increment, value)
+
+
+def test_get_rounder_reuses_closures():
+    assert get_rounder("up", 15) is get_rounder("up", 15)
+    assert get_rounder("up", 15) is not get_rounder("down", 15)